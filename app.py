@@ -2,39 +2,84 @@
 M2 Money Supply Tracker API
 Fetches M2 data from multiple public sources
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import json
+import threading
 from datetime import datetime, timedelta
 import os
 
 app = Flask(__name__, static_folder='static')
 CORS(app)
 
+# Pooled HTTP session so upstream calls reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=1.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 # Cache for data
 DATA_CACHE = {}
+CACHE_LOCKS = {}
 CACHE_EXPIRY = 3600  # 1 hour
 
 def get_cached_or_fetch(key, fetch_func):
-    """Simple cache implementation"""
-    now = datetime.now()
-    if key in DATA_CACHE:
-        data, timestamp = DATA_CACHE[key]
-        if (now - timestamp).seconds < CACHE_EXPIRY:
-            return data
-    
-    data = fetch_func()
-    DATA_CACHE[key] = (data, now)
-    return data
+    """Cache with a per-key refresh lock (stale-while-revalidate)
+
+    Only one request refreshes an expired key; concurrent requests are served
+    the stale value meanwhile, and a failed refresh falls back to it.
+    """
+    entry = DATA_CACHE.get(key)
+    if entry and (datetime.now() - entry[1]).total_seconds() < CACHE_EXPIRY:
+        return entry[0]
+
+    lock = CACHE_LOCKS.setdefault(key, threading.Lock())
+    if not lock.acquire(blocking=entry is None):
+        return entry[0]
+    try:
+        # Another request may have refreshed the key while we waited
+        entry = DATA_CACHE.get(key)
+        now = datetime.now()
+        if entry and (now - entry[1]).total_seconds() < CACHE_EXPIRY:
+            return entry[0]
+        try:
+            data = fetch_func()
+        except Exception:
+            if entry:
+                return entry[0]
+            raise
+        DATA_CACHE[key] = (data, now)
+        return data
+    finally:
+        lock.release()
+
+RESPONSE_CACHE = {}
+
+def get_cached_response(key, fetch_func, render):
+    """JSON body rendered from cached data
+
+    The body is re-encoded only when get_cached_or_fetch hands back a
+    refreshed data object, not on every request.
+    """
+    data = get_cached_or_fetch(key, fetch_func)
+    cached = RESPONSE_CACHE.get(key)
+    if cached is None or cached[0] is not data:
+        cached = (data, json.dumps(render(data)).encode())
+        RESPONSE_CACHE[key] = cached
+    return cached[1]
 
 def fetch_worldbank_m2(country_code):
     """Fetch M2 data from World Bank API"""
     try:
         # World Bank M2 indicator: FM.LBL.MQMY.ZG (M2 YoY growth) or FM.LBL.MQMY.CN (M2 total)
         url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/FM.LBL.MQMY.CN?format=json&per_page=100&date=2010:2025"
-        response = requests.get(url, timeout=30)
+        response = SESSION.get(url, timeout=30)
         data = response.json()
         
         if len(data) > 1 and data[1]:
@@ -62,7 +107,7 @@ def fetch_fred_m2():
             return generate_us_m2_data()
         
         url = f"https://api.stlouisfed.org/fred/series/observations?series_id=M2SL&api_key={api_key}&file_type=json"
-        response = requests.get(url, timeout=30)
+        response = SESSION.get(url, timeout=30)
         data = response.json()
         
         results = []
@@ -182,19 +227,26 @@ COUNTRIES = {
     }
 }
 
+# The country list is static per deploy: encode it once at import time
+COUNTRIES_JSON = json.dumps({
+    'countries': [
+        {
+            'code': code,
+            'name': info['name'],
+            'currency': info['currency'],
+            'unit': info['unit']
+        } for code, info in COUNTRIES.items()
+    ]
+}).encode()
+
 @app.route('/api/countries')
 def get_countries():
     """Return list of available countries"""
-    return jsonify({
-        'countries': [
-            {
-                'code': code,
-                'name': info['name'],
-                'currency': info['currency'],
-                'unit': info['unit']
-            } for code, info in COUNTRIES.items()
-        ]
-    })
+    return Response(
+        COUNTRIES_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
 
 @app.route('/api/m2/<country_code>')
 def get_m2_data(country_code):
@@ -203,18 +255,21 @@ def get_m2_data(country_code):
         return jsonify({'error': 'Country not found'}), 404
     
     country = COUNTRIES[country_code]
-    data = get_cached_or_fetch(f'm2_{country_code}', country['fetch'])
-    
-    return jsonify({
-        'country': {
-            'code': country_code,
-            'name': country['name'],
-            'currency': country['currency'],
-            'unit': country['unit']
-        },
-        'data': data,
-        'lastUpdated': datetime.now().isoformat()
-    })
+    body = get_cached_response(
+        f'm2_{country_code}',
+        country['fetch'],
+        lambda data: {
+            'country': {
+                'code': country_code,
+                'name': country['name'],
+                'currency': country['currency'],
+                'unit': country['unit']
+            },
+            'data': data,
+            'lastUpdated': datetime.now().isoformat()
+        }
+    )
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/m2')
 def get_all_m2():
@@ -250,4 +305,10 @@ def static_files(path):
     return send_from_directory('static', path)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(
+        debug=os.environ.get('FLASK_DEBUG', '0') == '1',
+        host='0.0.0.0',
+        port=int(os.environ.get('PORT', 5000)),
+        threaded=True
+    )
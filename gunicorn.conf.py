@@ -0,0 +1,18 @@
+"""Gunicorn settings for serving app.py in production.
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+import os
+
+bind = '0.0.0.0:' + os.environ.get('PORT', '5000')
+
+# Threaded workers with keep-alive, so clients reuse connections across /api calls
+worker_class = 'gthread'
+workers = 2
+threads = 8
+keepalive = 30
+timeout = 60
+
+# Import the app before forking: the prebuilt /api/countries body and the
+# pooled HTTP session are then shared copy-on-write by all workers
+preload_app = True
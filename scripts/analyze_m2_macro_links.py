@@ -7,15 +7,36 @@ Reads docs/data/m2_long_history.json and writes a summary JSON for reporting.
 from __future__ import annotations
 
 import json
+import pickle
 from pathlib import Path
 from typing import Dict, List
 
 import numpy as np
+import orjson
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_PATH = ROOT / "docs" / "data" / "m2_long_history.json"
 OUT_PATH = ROOT / "reports" / "m2_macro_analysis_summary.json"
+CACHE_DIR = ROOT / ".cache" / "analysis"
+
+
+def load_payload(path: Path = DATA_PATH) -> dict:
+    """Parse the dataset JSON, memoized in a pickle keyed by the source's mtime and size."""
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache = CACHE_DIR / f"{path.stem}.pkl"
+    try:
+        cached_stamp, payload = pickle.loads(cache.read_bytes())
+        if cached_stamp == stamp:
+            return payload
+    except Exception:
+        pass
+
+    payload = orjson.loads(path.read_bytes())
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    cache.write_bytes(pickle.dumps((stamp, payload), protocol=5))
+    return payload
 
 
 def safe_corr(a: pd.Series, b: pd.Series) -> float | None:
@@ -27,29 +48,36 @@ def safe_corr(a: pd.Series, b: pd.Series) -> float | None:
 
 
 def main() -> None:
-    payload = json.loads(DATA_PATH.read_text())
+    payload = load_payload()
     countries = payload["countries"]
     fx = payload["fx"]["usdPerCurrency"]
 
-    rows: List[dict] = []
+    # Build each currency's FX return series once; DE/FR/IT all share EUR.
+    fx_ret_by_ccy: Dict[str, pd.Series] = {}
+    for ccy, vals in fx.items():
+        fx_ser = pd.Series({int(y): float(v) for y, v in vals.items()}).sort_index()
+        fx_ret_by_ccy[ccy] = 100.0 * fx_ser.pct_change()  # + => local currency appreciated vs USD
+
+    frames: List[pd.DataFrame] = []
     for code, info in countries.items():
         ccy = info["currency"]
-        fx_ser = pd.Series({int(y): float(v) for y, v in fx[ccy].items()}).sort_index()
-        fx_ret = 100.0 * fx_ser.pct_change()  # + => local currency appreciated vs USD
+        fx_ret = fx_ret_by_ccy[ccy]
 
         annual = pd.DataFrame(info["annual"])
         if annual.empty or "year" not in annual.columns:
             continue
+        # All-None columns (e.g. no lending rate) would otherwise load as object dtype
+        annual = annual.astype({"m2_local": float, "m2_growth_pct": float, "lending_rate_pct": float})
         annual = annual.sort_values("year")
 
-        annual["fx_change_pct"] = annual["year"].map(fx_ret)
+        annual = annual.join(fx_ret.rename("fx_change_pct"), on="year")
         annual["m2_growth_lag1"] = annual["m2_growth_pct"].shift(1)
         annual["code"] = code
         annual["country"] = info["name"]
         annual["currency"] = ccy
-        rows.extend(annual.to_dict("records"))
+        frames.append(annual)
 
-    df = pd.DataFrame(rows)
+    df = pd.concat(frames, ignore_index=True)
 
     # Country-level correlations
     corr_rows = []
@@ -68,43 +96,42 @@ def main() -> None:
     reg_df = df[["m2_growth_pct", "lending_rate_pct", "fx_change_pct", "m2_growth_lag1", "code"]].dropna().copy()
     y = reg_df["m2_growth_pct"].values
 
-    dummies = pd.get_dummies(reg_df["code"], drop_first=True)
-    X_df = pd.concat(
-        [
-            pd.Series(1.0, index=reg_df.index, name="const"),
-            reg_df[["lending_rate_pct", "fx_change_pct", "m2_growth_lag1"]],
-            dummies,
-        ],
-        axis=1,
-    )
+    # Design matrix: const, regressors, then one dummy per country after the
+    # first in sorted order (same layout as get_dummies(drop_first=True)).
+    regressors = ["lending_rate_pct", "fx_change_pct", "m2_growth_lag1"]
+    codes, uniq = pd.factorize(reg_df["code"], sort=True)
+    columns = ["const", *regressors, *uniq[1:]]
+    X = np.empty((len(reg_df), len(columns)), dtype=np.float64)
+    X[:, 0] = 1.0
+    X[:, 1 : 1 + len(regressors)] = reg_df[regressors].to_numpy(dtype=np.float64)
+    X[:, 1 + len(regressors) :] = codes[:, None] == np.arange(1, len(uniq))[None, :]
+
+    n = len(y)
+    k = X.shape[1]
 
-    X = X_df.values.astype(float)
-    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+    # Normal equations: one factorization of the k x k X'X yields both beta and
+    # (X'X)^-1 for the standard errors, instead of an SVD lstsq plus an inv().
+    sol = np.linalg.solve(X.T @ X, np.column_stack([X.T @ y, np.eye(k)]))
+    beta = sol[:, 0]
+    xtx_inv = sol[:, 1:]
     y_hat = X @ beta
     resid = y - y_hat
 
-    n = len(y)
-    k = X.shape[1]
     dof = max(n - k, 1)
     sigma2 = float((resid @ resid) / dof)
-    xtx_inv = np.linalg.inv(X.T @ X)
-    se = np.sqrt(np.diag(sigma2 * xtx_inv))
+    se = np.sqrt(sigma2 * np.diag(xtx_inv))
     t_stats = beta / se
 
     ss_tot = float(((y - y.mean()) ** 2).sum())
     ss_res = float((resid**2).sum())
     r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else None
 
-    coeffs = []
-    for i, name in enumerate(X_df.columns):
-        coeffs.append(
-            {
-                "variable": name,
-                "coef": float(beta[i]),
-                "std_err": float(se[i]),
-                "t_stat": float(t_stats[i]),
-            }
-        )
+    coef_table = np.column_stack([beta, se, t_stats])
+    coef_table = np.where(np.isfinite(coef_table), coef_table, None).tolist()
+    coeffs = [
+        {"variable": name, "coef": c, "std_err": e, "t_stat": t}
+        for name, (c, e, t) in zip(columns, coef_table)
+    ]
 
     # Event windows: average M2 growth across countries around key years
     event_stats = []
@@ -158,19 +185,9 @@ def main() -> None:
         "recent_summary_2015_2025": recent_summary.to_dict("records"),
     }
 
-    def _sanitize(v):
-        if isinstance(v, float) and (np.isnan(v) or np.isinf(v)):
-            return None
-        if isinstance(v, dict):
-            return {k: _sanitize(x) for k, x in v.items()}
-        if isinstance(v, list):
-            return [_sanitize(x) for x in v]
-        return v
-
-    out = _sanitize(out)
-
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    OUT_PATH.write_text(json.dumps(out, indent=2, allow_nan=False))
+    # orjson writes any remaining non-finite float (e.g. an all-NaN window mean) as null
+    OUT_PATH.write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f"Wrote {OUT_PATH}")
     print(json.dumps(out["sample"], indent=2))
     print("R2:", out["pooled_ols"]["r2"])
@@ -17,25 +17,48 @@ Outputs:
 
 from __future__ import annotations
 
+import atexit
+import hashlib
+import io
 import json
 import math
+import os
+import shutil
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from statistics import median
-from typing import Dict, Tuple
+from typing import BinaryIO, Callable, Dict, List, Tuple, TypeVar
 import xml.etree.ElementTree as ET
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 ROOT = Path(__file__).resolve().parents[1]
 OUT_DOCS = ROOT / "docs" / "data" / "m2_long_history.json"
 OUT_STATIC = ROOT / "static" / "data" / "m2_long_history.json"
+CACHE_DIR = ROOT / ".cache"
+CACHE_TTL_SECONDS = 24 * 3600  # one scheduled update per day picks up source revisions
 
-WB_API = "https://api.worldbank.org/v2/country/{country}/indicator/{indicator}?format=json&per_page=2000&date={start}:{end}"
+# `indicators` is a ";"-joined list; multi-indicator queries require the source id (2 = WDI)
+WB_API = "https://api.worldbank.org/v2/country/{country}/indicator/{indicators}?source=2&format=json&per_page=2000&date={start}:{end}"
 OECD_MONAGG_API = "https://sdmx.oecd.org/public/rest/data/DSD_STES@DF_MONAGG/{key}?startPeriod={start}&endPeriod={end}"
+SDMX_GENERIC_NS = "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/data/generic"
+# Clark-notation tags/paths, resolved once so ElementTree never maps the "generic:" prefix
+SDMX_SERIES_TAG = f"{{{SDMX_GENERIC_NS}}}Series"
+SDMX_OBS_TAG = f"{{{SDMX_GENERIC_NS}}}Obs"
+SDMX_OBS_DIMENSION_TAG = f"{{{SDMX_GENERIC_NS}}}ObsDimension"
+SDMX_OBS_VALUE_TAG = f"{{{SDMX_GENERIC_NS}}}ObsValue"
+SDMX_KEY_VALUES_PATH = f"{{{SDMX_GENERIC_NS}}}SeriesKey/{{{SDMX_GENERIC_NS}}}Value"
+SDMX_ATTR_VALUES_PATH = f"{{{SDMX_GENERIC_NS}}}Attributes/{{{SDMX_GENERIC_NS}}}Value"
 
 M2_IND = "FM.LBL.BMNY.CN"  # Broad money, current LCU
 M2_GROWTH_IND = "FM.LBL.BMNY.ZG"  # Broad money growth (annual %)
@@ -43,6 +66,36 @@ FX_IND = "PA.NUS.FCRF"  # Official exchange rate (LCU per USD)
 INT_RATE_IND = "FR.INR.LEND"  # Lending interest rate (%)
 GDP_USD_IND = "NY.GDP.MKTP.CD"  # GDP current US$
 
+# World Bank series fetched for every country, keyed by their slot in wb_data
+WB_COUNTRY_INDICATORS = {
+    "m2": M2_IND,
+    "growth": M2_GROWTH_IND,
+    "interest": INT_RATE_IND,
+    "gdp_usd": GDP_USD_IND,
+}
+FETCH_WORKERS = 16
+# yfinance is the slowest and least reliable upstream; WB annual FX is enough for
+# an annual dataset, so Yahoo FX is opt-in.
+USE_YFINANCE = os.getenv("USE_YFINANCE", "0") == "1"
+
+# Shared keep-alive session: the build issues dozens of calls against the same
+# hosts, so reuse pooled connections instead of a fresh TLS handshake per call.
+# Each host pool holds one connection per fetch worker; a smaller pool would make
+# urllib3 discard the surplus connections instead of keeping them alive.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=FETCH_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=1.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+atexit.register(SESSION.close)
+
+# Keep yfinance's own timezone cache alongside ours instead of the user cache dir
+yf.set_tz_cache_location(str(CACHE_DIR / "yfinance-tz"))
+
 START_YEAR = 1980
 PROVISIONAL_END_YEAR = datetime.now(UTC).year - 1
 
@@ -90,28 +143,103 @@ EVENTS = [
 ]
 
 
-def wb_series(country: str, indicator: str, start: int, end: int) -> Dict[int, float]:
-    url = WB_API.format(country=country, indicator=indicator, start=start, end=end)
+def clear_cache() -> None:
+    """Drop cached HTTP responses and yfinance FX aggregates so the next build refetches them.
+
+    Other entries under .cache/ (analysis pickle, yfinance timezone DB) are left alone.
+    """
+    for namespace in ("http", "yfinance"):
+        shutil.rmtree(CACHE_DIR / namespace, ignore_errors=True)
+
+
+def _cache_path(namespace: str, key: str) -> Path:
+    return CACHE_DIR / namespace / hashlib.sha256(key.encode()).hexdigest()
+
+
+def _cache_read(path: Path, max_age: float | None = CACHE_TTL_SECONDS) -> bytes | None:
+    try:
+        if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _cache_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+T = TypeVar("T")
+
+
+def cached_get(url: str, timeout: float, parse: Callable[[bytes], T]) -> T:
+    """GET `url` through SESSION with an on-disk body cache keyed by URL; returns parse(body).
 
-    data = None
-    for attempt in range(1, 4):
+    A body is only cached once `parse` accepts it, so an upstream error reply never
+    replaces a good entry. Fresh entries skip the network entirely; if the request
+    fails or its body does not parse, an expired entry is served instead
+    (stale-if-error). clear_cache() forces a refetch.
+    """
+    path = _cache_path("http", url)
+    body = _cache_read(path)
+    if body is not None:
         try:
-            r = requests.get(url, timeout=60)
-            r.raise_for_status()
-            data = r.json()
-            break
+            return parse(body)
         except Exception:
-            if attempt == 3:
-                return {}
-            time.sleep(1.5 * attempt)
-
-    out: Dict[int, float] = {}
-    if isinstance(data, list) and len(data) > 1 and data[1]:
-        for row in data[1]:
-            if row.get("value") is None:
-                continue
-            y = int(row["date"])
-            out[y] = float(row["value"])
+            pass  # unreadable entry: refetch below
+
+    try:
+        r = SESSION.get(url, timeout=timeout)
+        r.raise_for_status()
+        result = parse(r.content)
+    except Exception:
+        body = _cache_read(path, max_age=None)
+        if body is None:
+            raise
+        return parse(body)
+
+    _cache_write(path, r.content)
+    return result
+
+
+def _parse_wb_rows(body: bytes) -> list:
+    """Decode a WDI response into its data rows.
+
+    Error replies ([{"message": [...]}]) and non-JSON pages raise ValueError.
+    """
+    data = orjson.loads(body)
+    if not (isinstance(data, list) and len(data) > 1 and isinstance(data[1], list)):
+        raise ValueError(f"unexpected World Bank response: {body[:200]!r}")
+    return data[1]
+
+
+def wb_series(country: str, indicator: str, start: int, end: int) -> Dict[int, float]:
+    return wb_multi_series(country, [indicator], start, end)[indicator]
+
+
+def wb_multi_series(country: str, indicators: List[str], start: int, end: int) -> Dict[str, Dict[int, float]]:
+    """Fetch several WDI indicators for one country in a single round-trip.
+
+    Returns indicator -> {year: value}; every requested indicator is present, empty on failure.
+    """
+    url = WB_API.format(country=country, indicators=";".join(indicators), start=start, end=end)
+    out: Dict[str, Dict[int, float]] = {ind: {} for ind in indicators}
+
+    try:
+        rows = cached_get(url, timeout=60, parse=_parse_wb_rows)
+    except Exception:
+        rows = []
+
+    for row in rows:
+        if row.get("value") is None:
+            continue
+        series = out.get(row["indicator"]["id"])
+        if series is None:
+            continue
+        series[int(row["date"])] = float(row["value"])
     return out
 
 
@@ -124,6 +252,65 @@ def _parse_year(period: str) -> int | None:
         return None
 
 
+def _parse_sdmx_series(series: ET.Element) -> Tuple[str, str, Dict[int, float]] | None:
+    """Extract (REF_AREA, ADJUSTMENT, {year: value}) from one SDMX generic Series element."""
+    key = {v.get("id"): v.get("value") for v in series.iterfind(SDMX_KEY_VALUES_PATH)}
+    area = key.get("REF_AREA")
+    adj = key.get("ADJUSTMENT", "")
+    if not area:
+        return None
+
+    attrs = {v.get("id"): v.get("value") for v in series.iterfind(SDMX_ATTR_VALUES_PATH)}
+    try:
+        unit_mult = int(attrs.get("UNIT_MULT", "0"))
+    except (TypeError, ValueError):
+        unit_mult = 0
+
+    s: Dict[int, float] = {}
+    for obs in series.iterfind(SDMX_OBS_TAG):
+        d = obs.find(SDMX_OBS_DIMENSION_TAG)
+        v = obs.find(SDMX_OBS_VALUE_TAG)
+        if d is None or v is None:
+            continue
+        year = _parse_year(d.attrib.get("value", ""))
+        if year is None:
+            continue
+        try:
+            val = float(v.attrib.get("value", "nan"))
+        except Exception:
+            continue
+        if not math.isfinite(val):
+            continue
+        s[year] = val * (10 ** unit_mult)
+    return area, adj, s
+
+
+def _parse_sdmx_generic(xml_bytes: bytes) -> Dict[str, Dict[str, Dict[int, float]]]:
+    """Parse an SDMX generic data message into area -> adjustment -> {year: value}.
+
+    Raises (ET.ParseError / ValueError) on anything that is not a GenericData message.
+    """
+    raw: Dict[str, Dict[str, Dict[int, float]]] = {}
+    root = None
+    # Stream the document and drop each Series subtree once parsed, so the
+    # full multi-MB DOM is never held in memory at once.
+    for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+        root = elem
+        if elem.tag != SDMX_SERIES_TAG:
+            continue
+        parsed = _parse_sdmx_series(elem)
+        elem.clear()
+        if parsed is None:
+            continue
+        area, adj, values = parsed
+        raw.setdefault(area, {}).setdefault(adj, {}).update(values)
+
+    # The last closed element is the document root
+    if root is None or not root.tag.endswith("}GenericData"):
+        raise ValueError(f"unexpected OECD response root: {getattr(root, 'tag', None)!r}")
+    return raw
+
+
 def fetch_oecd_monetary_annual(measure: str, start: int, end: int) -> Tuple[Dict[str, Dict[int, float]], Dict[str, str]]:
     """Fetch OECD annual monetary aggregate (MABM or MANM) in XDC.
 
@@ -138,64 +325,16 @@ def fetch_oecd_monetary_annual(measure: str, start: int, end: int) -> Tuple[Dict
     key = f".A.{measure}.XDC._Z.._Z._Z.N"
     url = OECD_MONAGG_API.format(key=key, start=start, end=end)
 
-    xml_txt = None
+    # SESSION already retries 429s; the outer loop adds the gentler backoff the OECD rate limit needs
     for attempt in range(1, 6):
         try:
-            r = requests.get(url, timeout=120)
-            if r.status_code == 429:
-                # OECD rate limit: gentle backoff
-                time.sleep(2.0 * attempt)
-                continue
-            r.raise_for_status()
-            xml_txt = r.text
+            raw = cached_get(url, timeout=120, parse=_parse_sdmx_generic)
             break
         except Exception:
             if attempt == 5:
                 return {}, {}
             time.sleep(2.0 * attempt)
 
-    ns = {"generic": "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/data/generic"}
-    root = ET.fromstring(xml_txt)
-
-    # area -> adj -> year -> value
-    raw: Dict[str, Dict[str, Dict[int, float]]] = {}
-    for series in root.findall('.//generic:Series', ns):
-        sk = series.find('generic:SeriesKey', ns)
-        if sk is None:
-            continue
-        kv = {v.attrib["id"]: v.attrib["value"] for v in sk.findall('generic:Value', ns)}
-        area = kv.get("REF_AREA")
-        adj = kv.get("ADJUSTMENT", "")
-        if not area:
-            continue
-
-        attrs = series.find('generic:Attributes', ns)
-        unit_mult = 0
-        if attrs is not None:
-            for a in attrs.findall('generic:Value', ns):
-                if a.attrib.get("id") == "UNIT_MULT":
-                    try:
-                        unit_mult = int(a.attrib.get("value", "0"))
-                    except Exception:
-                        unit_mult = 0
-
-        s = raw.setdefault(area, {}).setdefault(adj, {})
-        for obs in series.findall('generic:Obs', ns):
-            d = obs.find('generic:ObsDimension', ns)
-            v = obs.find('generic:ObsValue', ns)
-            if d is None or v is None:
-                continue
-            year = _parse_year(d.attrib.get("value", ""))
-            if year is None:
-                continue
-            try:
-                val = float(v.attrib.get("value", "nan"))
-            except Exception:
-                continue
-            if not math.isfinite(val):
-                continue
-            s[year] = val * (10 ** unit_mult)
-
     collapsed: Dict[str, Dict[int, float]] = {}
     source: Dict[str, str] = {}
     for area, adjs in raw.items():
@@ -227,39 +366,79 @@ def _to_annual_close(df: pd.DataFrame) -> Dict[int, float]:
     close = close.dropna()
     if close.empty:
         return {}
-    annual = close.groupby(close.index.year).mean()
-    return {int(y): float(v) for y, v in annual.items() if pd.notna(v) and v > 0}
+    annual = close.resample("YS").mean().dropna()
+    return {int(ts.year): float(v) for ts, v in annual.items() if v > 0}
 
 
-def yfinance_usd_per_currency(currency: str, start: int, end: int) -> Tuple[Dict[int, float], str]:
-    """Return annual USD per 1 unit of currency using yfinance, or empty dict on failure."""
-    if currency == "USD":
-        return {y: 1.0 for y in range(start, end + 1)}, "fixed"
-
-    tickers = [
+def yf_tickers(currency: str) -> List[Tuple[str, bool]]:
+    """Candidate Yahoo FX tickers for `currency` as (ticker, invert) pairs, in preference order."""
+    return [
         (f"{currency}USD=X", False),
         (f"USD{currency}=X", True),
     ]
 
-    for ticker, invert in tickers:
+
+def yf_annual_closes(tickers: List[str], start: int, end: int) -> Dict[str, Dict[int, float]]:
+    """Annual mean close per ticker; all uncached tickers are fetched in one yf.download batch.
+
+    Tickers without data map to an empty dict; only confirmed no-data results are cached.
+    """
+    # yfinance manages its own HTTP session, so cache the (small) annual aggregates instead
+    out: Dict[str, Dict[int, float]] = {}
+    missing = []
+    for ticker in tickers:
+        cached = _cache_read(_cache_path("yfinance", f"{ticker}:{start}:{end}"))
+        if cached is not None:
+            out[ticker] = {int(y): float(v) for y, v in json.loads(cached).items()}
+        else:
+            missing.append(ticker)
+
+    if missing:
         try:
             df = yf.download(
-                ticker,
+                tickers=missing,
                 start=f"{start}-01-01",
                 end=f"{end + 1}-01-01",
                 interval="1mo",
+                group_by="ticker",
                 auto_adjust=False,
                 progress=False,
-                threads=False,
+                threads=True,
             )
-            annual = _to_annual_close(df)
-            if not annual:
-                continue
-            if invert:
-                annual = {y: (1.0 / v) for y, v in annual.items() if v and v > 0}
-            return annual, f"yfinance:{ticker}"
         except Exception:
+            df = None
+
+        # yf.download fetches each ticker separately and records per-ticker failures in
+        # yf.shared._ERRORS instead of raising. Only cache an empty result when Yahoo
+        # answered with no prices (e.g. USDEUR=X); timeouts, rate limits and tz lookup
+        # failures are transient and retried next build.
+        errors = dict(yf.shared._ERRORS) if df is not None else {}
+        for ticker in missing:
+            if df is not None and isinstance(df.columns, pd.MultiIndex):
+                sub = df[ticker] if ticker in df.columns.get_level_values(0) else None
+            else:
+                sub = df
+            annual = _to_annual_close(sub)
+            err = errors.get(ticker.upper())
+            if annual or (df is not None and (err is None or "YFPricesMissingError" in err)):
+                _cache_write(_cache_path("yfinance", f"{ticker}:{start}:{end}"), json.dumps(annual).encode())
+            out[ticker] = annual
+
+    return out
+
+
+def yfinance_usd_per_currency(currency: str, start: int, end: int, closes: Dict[str, Dict[int, float]]) -> Tuple[Dict[int, float], str]:
+    """Return annual USD per 1 unit of currency from prefetched yf_annual_closes(), or empty dict."""
+    if currency == "USD":
+        return {y: 1.0 for y in range(start, end + 1)}, "fixed"
+
+    for ticker, invert in yf_tickers(currency):
+        annual = closes.get(ticker)
+        if not annual:
             continue
+        if invert:
+            annual = {y: (1.0 / v) for y, v in annual.items() if v and v > 0}
+        return annual, f"yfinance:{ticker}"
 
     return {}, ""
 
@@ -276,13 +455,19 @@ def wb_usd_per_currency(currency: str, start: int, end: int) -> Tuple[Dict[int,
 
 
 def fill_years(s: Dict[int, float], start: int, end: int) -> Dict[int, float]:
-    years = list(range(start, end + 1))
-    if not s:
-        return {y: math.nan for y in years}
-    ser = pd.Series(s).sort_index()
-    ser = ser.reindex(years)
-    ser = ser.interpolate(limit_direction="both").ffill().bfill()
-    return {int(y): float(v) for y, v in ser.items()}
+    years = np.arange(start, end + 1)
+    vals = np.full(end - start + 1, np.nan, dtype=np.float64)
+    for y, v in s.items():
+        if start <= y <= end:
+            vals[y - start] = v
+    known = np.isfinite(vals)
+    if not known.any():
+        return {y: math.nan for y in years.tolist()}
+    if not known.all():
+        # Linear between known years, carrying the edge values outward (same as
+        # pandas interpolate(limit_direction="both") on a contiguous year index)
+        vals = np.interp(years, years[known], vals[known])
+    return dict(zip(years.tolist(), vals.tolist()))
 
 
 def fit_scale_factor(wb_level: Dict[int, float], oecd_level: Dict[int, float]) -> float:
@@ -297,36 +482,48 @@ def fit_scale_factor(wb_level: Dict[int, float], oecd_level: Dict[int, float]) -
 
 
 def fill_from_growth(level: Dict[int, float], growth_pct: Dict[int, float], start: int, end: int, source_map: Dict[int, str]) -> Dict[int, float]:
+    # One sweep in each direction reaches the fixed point: the forward sweep
+    # chains every run after a known year, and a backward fill at y needs y+1
+    # already known, so it can never open up a new forward fill.
     out = dict(level)
-    changed = True
-    while changed:
-        changed = False
-
-        # forward chain: y = y-1 * (1+g_y)
-        for y in range(start + 1, end + 1):
-            if y in out:
-                continue
-            if (y - 1) in out and y in growth_pct:
-                g = growth_pct[y]
-                out[y] = out[y - 1] * (1.0 + g / 100.0)
+
+    # forward chain: y = y-1 * (1+g_y)
+    for y in range(start + 1, end + 1):
+        if y in out:
+            continue
+        if (y - 1) in out and y in growth_pct:
+            g = growth_pct[y]
+            out[y] = out[y - 1] * (1.0 + g / 100.0)
+            source_map[y] = source_map.get(y, "growth_chained")
+
+    # backward chain: y = y+1 / (1+g_{y+1})
+    for y in range(end - 1, start - 1, -1):
+        if y in out:
+            continue
+        if (y + 1) in out and (y + 1) in growth_pct:
+            g_next = growth_pct[y + 1]
+            denom = 1.0 + g_next / 100.0
+            if denom != 0:
+                out[y] = out[y + 1] / denom
                 source_map[y] = source_map.get(y, "growth_chained")
-                changed = True
-
-        # backward chain: y = y+1 / (1+g_{y+1})
-        for y in range(end - 1, start - 1, -1):
-            if y in out:
-                continue
-            if (y + 1) in out and (y + 1) in growth_pct:
-                g_next = growth_pct[y + 1]
-                denom = 1.0 + g_next / 100.0
-                if denom != 0:
-                    out[y] = out[y + 1] / denom
-                    source_map[y] = source_map.get(y, "growth_chained")
-                    changed = True
 
     return out
 
 
+def coalesce_levels(layers: List[Tuple[str, Dict[int, float]]]) -> Tuple[Dict[int, float], Dict[int, str]]:
+    """Merge prioritized (source_tag, {year: value}) layers; each year keeps the first layer that has it.
+
+    Returns (level, source_map). Applying layers lowest-priority first lets
+    dict.update do the per-year overrides instead of a Python-level loop.
+    """
+    level: Dict[int, float] = {}
+    source_map: Dict[int, str] = {}
+    for tag, values in reversed(layers):
+        level.update(values)
+        source_map.update(dict.fromkeys(values, tag))
+    return level, source_map
+
+
 def compute_growth_from_level(level: Dict[int, float], start: int, end: int) -> Dict[int, float]:
     out = {}
     for y in range(start + 1, end + 1):
@@ -338,64 +535,163 @@ def compute_growth_from_level(level: Dict[int, float], start: int, end: int) ->
 def choose_final_end_year(country_payload: Dict[str, dict], start: int, provisional_end: int) -> int:
     # Prefer latest year with broad direct-source coverage (non-interpolated).
     direct = {"worldbank", "oecd_m3", "oecd_m1", "oecd_ea19_alloc"}
-    n_countries = len(country_payload)
+    threshold = max(5, int(0.6 * len(country_payload)))
+
+    # One pass over all rows: year -> number of countries with a direct-source value
+    covered = Counter(
+        r["year"] for c in country_payload.values() for r in c["annual"] if r.get("m2_source") in direct
+    )
+    return max((y for y in range(start, provisional_end + 1) if covered[y] >= threshold), default=start)
+
+
+def _build_country(
+    cfg: dict,
+    wb: Dict[str, Dict[int, float]],
+    oecd_m3_area: Dict[int, float] | None,
+    oecd_m1_area: Dict[int, float] | None,
+    ea: Dict[int, float] | None,
+    gdp_emu_usd: Dict[int, float],
+    scale: float,
+    global_scale: float,
+) -> dict:
+    """Merge, gap-fill and assemble one country's payload entry (`ea` is set only for EA19 proxies)."""
+    wb_m2 = dict(wb["m2"])
+    wb_growth = dict(wb["growth"])
+    wb_interest = dict(wb["interest"])
+    wb_gdp_usd = dict(wb["gdp_usd"])
+
+    # Direct level sources as (source tag, {year: value}) layers, highest priority first
+    # 1) WB direct level
+    layers: List[Tuple[str, Dict[int, float]]] = [("worldbank", wb_m2)]
+
+    # 2) OECD direct level (country-specific)
+    base = oecd_m3_area
+    src_tag = "oecd_m3"
+    if not base:
+        base = oecd_m1_area
+        src_tag = "oecd_m1"
+    if base:
+        layers.append((src_tag, {y: v * scale for y, v in base.items()}))
+
+    # 3) DE/FR/IT synthetic from EA19 allocation by GDP share in EMU
+    if ea is not None:
+        ea_alloc = {}
+        for y, ea_val in ea.items():
+            gc = wb_gdp_usd.get(y)
+            ge = gdp_emu_usd.get(y)
+            if gc and ge and ge > 0:
+                ea_alloc[y] = ea_val * (gc / ge) * global_scale
+        layers.append(("oecd_ea19_alloc", ea_alloc))
+
+    level, source_map = coalesce_levels(layers)
+
+    # 4) Growth-chain fill from WB growth
+    level = fill_from_growth(level, wb_growth, START_YEAR, PROVISIONAL_END_YEAR, source_map)
+
+    # 5) Residual interpolation/carry
+    filled = fill_years(level, START_YEAR, PROVISIONAL_END_YEAR)
+    for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
+        if y not in source_map:
+            if y in level:
+                source_map[y] = "growth_chained"
+            else:
+                source_map[y] = "interpolated"
+
+    # Growth series: prefer WB, fallback to implied from filled levels
+    implied_growth = compute_growth_from_level(filled, START_YEAR, PROVISIONAL_END_YEAR)
+    growth_final = {}
+    for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
+        if y in wb_growth:
+            growth_final[y] = wb_growth[y]
+        elif y in implied_growth:
+            growth_final[y] = implied_growth[y]
+        else:
+            growth_final[y] = None
 
-    best = start
-    for y in range(start, provisional_end + 1):
-        covered = 0
-        for _, c in country_payload.items():
-            row = next((r for r in c["annual"] if r["year"] == y), None)
-            if row and row.get("m2_source") in direct:
-                covered += 1
-        if covered >= max(5, int(0.6 * n_countries)):
-            best = y
-    return best
+    annual = []
+    for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
+        annual.append(
+            {
+                "year": y,
+                "m2_local": filled.get(y),
+                "m2_growth_pct": growth_final.get(y),
+                "lending_rate_pct": wb_interest.get(y),
+                "m2_source": source_map.get(y),
+            }
+        )
+
+    return {
+        "name": cfg["name"],
+        "wb": cfg["wb"],
+        "currency": cfg["currency"],
+        "gdpRank": cfg["gdpRank"],
+        "annual": annual,
+    }
 
 
 def build() -> dict:
     currencies = sorted({cfg["currency"] for cfg in COUNTRIES.values()})
 
-    # FX table: USD per 1 local currency
-    fx_usd_per_ccy: Dict[str, Dict[int, float]] = {}
-    fx_sources: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        # Every upstream call below is pure network I/O: queue them all up front
+        # so WB, OECD (and opt-in yfinance) requests overlap instead of running back to back.
+        wb_futures = {
+            code: pool.submit(
+                wb_multi_series, cfg["wb"], list(WB_COUNTRY_INDICATORS.values()), START_YEAR, PROVISIONAL_END_YEAR
+            )
+            for code, cfg in COUNTRIES.items()
+        }
+        # WB GDP for EMU aggregate (used to split EA19 monetary aggregate across DE/FR/IT)
+        gdp_emu_future = pool.submit(wb_series, EMU_WB_CODE, GDP_USD_IND, START_YEAR, PROVISIONAL_END_YEAR)
+
+        # OECD monetary aggregates (annual)
+        oecd_m3_future = pool.submit(fetch_oecd_monetary_annual, "MABM", START_YEAR, PROVISIONAL_END_YEAR)
+        oecd_m1_future = pool.submit(fetch_oecd_monetary_annual, "MANM", START_YEAR, PROVISIONAL_END_YEAR)
+
+        yf_future = None
+        if USE_YFINANCE:
+            yf_future = pool.submit(
+                yf_annual_closes,
+                [t for ccy in currencies if ccy != "USD" for t, _ in yf_tickers(ccy)],
+                START_YEAR,
+                PROVISIONAL_END_YEAR,
+            )
+        wb_fx_futures = {
+            ccy: pool.submit(wb_usd_per_currency, ccy, START_YEAR, PROVISIONAL_END_YEAR) for ccy in currencies
+        }
 
-    for ccy in currencies:
-        yf_vals, yf_src = yfinance_usd_per_currency(ccy, START_YEAR, PROVISIONAL_END_YEAR)
-        if yf_vals:
-            fx_usd_per_ccy[ccy] = fill_years(yf_vals, START_YEAR, PROVISIONAL_END_YEAR)
-            fx_sources[ccy] = yf_src
-        else:
-            wb_vals, wb_src = wb_usd_per_currency(ccy, START_YEAR, PROVISIONAL_END_YEAR)
-            fx_usd_per_ccy[ccy] = fill_years(wb_vals, START_YEAR, PROVISIONAL_END_YEAR)
-            fx_sources[ccy] = wb_src
+        # FX table: USD per 1 local currency
+        fx_usd_per_ccy: Dict[str, Dict[int, float]] = {}
+        fx_sources: Dict[str, str] = {}
+
+        # Without yfinance every non-USD currency falls through to WB FX
+        yf_closes = yf_future.result() if yf_future is not None else {}
+        for ccy in currencies:
+            yf_vals, yf_src = yfinance_usd_per_currency(ccy, START_YEAR, PROVISIONAL_END_YEAR, yf_closes)
+            if yf_vals:
+                fx_usd_per_ccy[ccy] = fill_years(yf_vals, START_YEAR, PROVISIONAL_END_YEAR)
+                fx_sources[ccy] = yf_src
+            else:
+                wb_vals, wb_src = wb_fx_futures[ccy].result()
+                fx_usd_per_ccy[ccy] = fill_years(wb_vals, START_YEAR, PROVISIONAL_END_YEAR)
+                fx_sources[ccy] = wb_src
 
-    # OECD monetary aggregates (annual)
-    oecd_m3, oecd_m3_src = fetch_oecd_monetary_annual("MABM", START_YEAR, PROVISIONAL_END_YEAR)
-    oecd_m1, oecd_m1_src = fetch_oecd_monetary_annual("MANM", START_YEAR, PROVISIONAL_END_YEAR)
+        oecd_m3, oecd_m3_src = oecd_m3_future.result()
+        oecd_m1, oecd_m1_src = oecd_m1_future.result()
 
-    # WB GDP for EMU aggregate (used to split EA19 monetary aggregate across DE/FR/IT)
-    gdp_emu_usd = wb_series(EMU_WB_CODE, GDP_USD_IND, START_YEAR, PROVISIONAL_END_YEAR)
+        gdp_emu_usd = gdp_emu_future.result()
+        wb_data = {}
+        for code, fut in wb_futures.items():
+            series = fut.result()
+            wb_data[code] = {key: series[ind] for key, ind in WB_COUNTRY_INDICATORS.items()}
 
     # First pass: gather WB and OECD scales for countries with both
-    wb_data = {}
     scale_factors = {}
     for code, cfg in COUNTRIES.items():
-        wb_m2 = wb_series(cfg["wb"], M2_IND, START_YEAR, PROVISIONAL_END_YEAR)
-        wb_growth = wb_series(cfg["wb"], M2_GROWTH_IND, START_YEAR, PROVISIONAL_END_YEAR)
-        wb_interest = wb_series(cfg["wb"], INT_RATE_IND, START_YEAR, PROVISIONAL_END_YEAR)
-        wb_gdp_usd = wb_series(cfg["wb"], GDP_USD_IND, START_YEAR, PROVISIONAL_END_YEAR)
-
-        wb_data[code] = {
-            "m2": wb_m2,
-            "growth": wb_growth,
-            "interest": wb_interest,
-            "gdp_usd": wb_gdp_usd,
-        }
-
         area = cfg.get("oecdArea")
         if area:
             oecd_base = oecd_m3.get(area) or oecd_m1.get(area) or {}
-            scale_factors[code] = fit_scale_factor(wb_m2, oecd_base)
+            scale_factors[code] = fit_scale_factor(wb_data[code]["m2"], oecd_base)
 
     # Global scale for countries without WB overlap (used for DE/FR/IT synthetic allocation)
     nontrivial_scales = [v for v in scale_factors.values() if v and math.isfinite(v) and v > 0]
@@ -403,92 +699,26 @@ def build() -> dict:
 
     country_payload = {}
     for code, cfg in COUNTRIES.items():
-        wb_m2 = dict(wb_data[code]["m2"])
-        wb_growth = dict(wb_data[code]["growth"])
-        wb_interest = dict(wb_data[code]["interest"])
-        wb_gdp_usd = dict(wb_data[code]["gdp_usd"])
-
-        source_map: Dict[int, str] = {}
-        level = {}
-
-        # 1) WB direct level
-        for y, v in wb_m2.items():
-            level[y] = v
-            source_map[y] = "worldbank"
-
-        # 2) OECD direct level (country-specific)
         area = cfg.get("oecdArea")
-        if area:
-            base = oecd_m3.get(area)
-            src_tag = "oecd_m3"
-            if not base:
-                base = oecd_m1.get(area)
-                src_tag = "oecd_m1"
-            if base:
-                scale = scale_factors.get(code, 1.0)
-                for y, v in base.items():
-                    if y not in level:
-                        level[y] = v * scale
-                        source_map[y] = src_tag
-
-        # 3) DE/FR/IT synthetic from EA19 allocation by GDP share in EMU
+        ea = None
         if code in EURO_PROXY_CODES:
             ea = oecd_m3.get(EA_AREA_CODE) or oecd_m1.get(EA_AREA_CODE) or {}
-            for y, ea_val in ea.items():
-                gc = wb_gdp_usd.get(y)
-                ge = gdp_emu_usd.get(y)
-                if gc and ge and ge > 0 and y not in level:
-                    level[y] = ea_val * (gc / ge) * global_scale
-                    source_map[y] = "oecd_ea19_alloc"
-
-        # 4) Growth-chain fill from WB growth
-        level = fill_from_growth(level, wb_growth, START_YEAR, PROVISIONAL_END_YEAR, source_map)
-
-        # 5) Residual interpolation/carry
-        filled = fill_years(level, START_YEAR, PROVISIONAL_END_YEAR)
-        for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
-            if y not in source_map:
-                if y in level:
-                    source_map[y] = "growth_chained"
-                else:
-                    source_map[y] = "interpolated"
-
-        # Growth series: prefer WB, fallback to implied from filled levels
-        implied_growth = compute_growth_from_level(filled, START_YEAR, PROVISIONAL_END_YEAR)
-        growth_final = {}
-        for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
-            if y in wb_growth:
-                growth_final[y] = wb_growth[y]
-            elif y in implied_growth:
-                growth_final[y] = implied_growth[y]
-            else:
-                growth_final[y] = None
-
-        annual = []
-        for y in range(START_YEAR, PROVISIONAL_END_YEAR + 1):
-            annual.append(
-                {
-                    "year": y,
-                    "m2_local": filled.get(y),
-                    "m2_growth_pct": growth_final.get(y),
-                    "lending_rate_pct": wb_interest.get(y),
-                    "m2_source": source_map.get(y),
-                }
-            )
-
-        country_payload[code] = {
-            "name": cfg["name"],
-            "wb": cfg["wb"],
-            "currency": cfg["currency"],
-            "gdpRank": cfg["gdpRank"],
-            "annual": annual,
-        }
+        country_payload[code] = _build_country(
+            cfg,
+            wb_data[code],
+            oecd_m3.get(area) if area else None,
+            oecd_m1.get(area) if area else None,
+            ea,
+            gdp_emu_usd,
+            scale_factors.get(code, 1.0),
+            global_scale,
+        )
 
     final_end = choose_final_end_year(country_payload, START_YEAR, PROVISIONAL_END_YEAR)
 
-    # truncate to final_end
-    for code in list(country_payload.keys()):
-        country_payload[code]["annual"] = [r for r in country_payload[code]["annual"] if r["year"] <= final_end]
+    # truncate to final_end (rows are one per year from START_YEAR, so index = year - START_YEAR)
+    for c in country_payload.values():
+        c["annual"] = c["annual"][: final_end - START_YEAR + 1]
 
     out = {
         "meta": {
@@ -501,7 +731,11 @@ def build() -> dict:
                 "Gap-filling source: OECD monetary aggregates (M3=MABM; fallback M1=MANM), annual XDC.",
                 "DE/FR/IT gap fill: EA19 aggregate allocated by country GDP share within EMU, then globally calibrated.",
                 "Residual gaps are filled via WB growth-chain and interpolation.",
-                "FX conversion uses yfinance annual average close where available; World Bank PA.NUS.FCRF fallback otherwise.",
+                (
+                    "FX conversion uses yfinance annual average close where available; World Bank PA.NUS.FCRF fallback otherwise."
+                    if USE_YFINANCE
+                    else "FX conversion uses World Bank official exchange rate (PA.NUS.FCRF) annual averages."
+                ),
                 "Cross-country comparability is indicative because national aggregate definitions differ.",
             ],
         },
@@ -533,11 +767,17 @@ def build() -> dict:
                 "name": "World Bank - Official Exchange Rate (LCU per USD)",
                 "url": "https://data.worldbank.org/indicator/PA.NUS.FCRF",
             },
-            {
-                "name": "Yahoo Finance (yfinance)",
-                "url": "https://finance.yahoo.com/",
-            },
-        ],
+        ]
+        + (
+            [
+                {
+                    "name": "Yahoo Finance (yfinance)",
+                    "url": "https://finance.yahoo.com/",
+                }
+            ]
+            if USE_YFINANCE
+            else []
+        ),
         "diagnostics": {
             "globalOecdToWbScale": global_scale,
             "countryScaleFactors": scale_factors,
@@ -548,14 +788,58 @@ def build() -> dict:
     return out
 
 
+# Year-keyed FX tables need OPT_NON_STR_KEYS
+DATASET_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _write_json_object(fh: BinaryIO, obj: dict, depth: int = 0, expand: Tuple[str, ...] = ()) -> None:
+    """Write `obj` one member at a time, byte-identical to orjson OPT_INDENT_2 output.
+
+    Members named in `expand` are streamed one level further instead of encoded whole.
+    """
+    if not obj:
+        fh.write(b"{}")
+        return
+    pad = b"\n" + b"  " * (depth + 1)
+    fh.write(b"{")
+    for i, (key, value) in enumerate(obj.items()):
+        fh.write((b"," if i else b"") + pad + orjson.dumps(key) + b": ")
+        if key in expand and isinstance(value, dict):
+            _write_json_object(fh, value, depth + 1)
+        else:
+            # Raw newlines only come from indentation (string newlines are escaped)
+            fh.write(orjson.dumps(value, option=DATASET_JSON_OPTIONS).replace(b"\n", pad))
+    fh.write(b"\n" + b"  " * depth + b"}")
+
+
+def write_dataset(payload: dict, docs_path: Path = OUT_DOCS, static_path: Path = OUT_STATIC) -> None:
+    """Stream the dataset to docs/ and mirror it to static/.
+
+    Encoding per top-level key (and per country) keeps only one section's bytes in memory at a time.
+    """
+    docs_path.parent.mkdir(parents=True, exist_ok=True)
+    static_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Stream into a sibling temp file and swap it in, so readers of docs/ (and the
+    # static/ link to it) never see a truncated file and a failed encode leaves both intact
+    tmp = docs_path.with_name(f"{docs_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as fh:
+            _write_json_object(fh, payload, expand=("countries",))
+        os.replace(tmp, docs_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    # Both outputs are identical: hard-link the second, copying where links are unsupported
+    static_path.unlink(missing_ok=True)
+    try:
+        os.link(docs_path, static_path)
+    except OSError:
+        shutil.copyfile(docs_path, static_path)
+
+
 def main() -> None:
     payload = build()
-    OUT_DOCS.parent.mkdir(parents=True, exist_ok=True)
-    OUT_STATIC.parent.mkdir(parents=True, exist_ok=True)
-
-    txt = json.dumps(payload, indent=2)
-    OUT_DOCS.write_text(txt)
-    OUT_STATIC.write_text(txt)
+    write_dataset(payload)
 
     print(f"Wrote: {OUT_DOCS}")
     print(f"Wrote: {OUT_STATIC}")
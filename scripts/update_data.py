@@ -17,11 +17,12 @@ from __future__ import annotations
 
 import argparse
 import json
-import math
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Dict
+
+import numpy as np
 
 ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS_DIR = Path(__file__).resolve().parent
@@ -36,8 +37,10 @@ DATA_STATIC = ROOT / "static" / "data" / "m2_long_history.json"
 SUMMARY_DEFAULT = ROOT / "reports" / "data_update_summary.json"
 
 
-def _is_valid_number(x: Any) -> bool:
-    return isinstance(x, (int, float)) and math.isfinite(float(x))
+def _count_finite(rows: list, field: str) -> int:
+    # None (missing) becomes NaN under the float64 cast, so one isfinite pass counts valid values
+    vals = np.array([r.get(field) for r in rows], dtype=np.float64)
+    return int(np.isfinite(vals).sum())
 
 
 def _coverage_summary(payload: dict) -> dict:
@@ -51,8 +54,8 @@ def _coverage_summary(payload: dict) -> dict:
 
     for code, c in countries.items():
         annual = c.get("annual", [])
-        valid_m2 = sum(1 for r in annual if _is_valid_number(r.get("m2_local")))
-        valid_growth = sum(1 for r in annual if _is_valid_number(r.get("m2_growth_pct")))
+        valid_m2 = _count_finite(annual, "m2_local")
+        valid_growth = _count_finite(annual, "m2_growth_pct")
         missing_m2 = expected_years - valid_m2
 
         total_missing_m2 += max(missing_m2, 0)
@@ -81,6 +84,7 @@ def update_data(
     run_analysis: bool = True,
     strict: bool = False,
     summary_path: Path = SUMMARY_DEFAULT,
+    use_cache: bool = True,
 ) -> dict:
     """Run full update pipeline and return update summary.
 
@@ -88,17 +92,17 @@ def update_data(
       run_analysis: regenerate reports/m2_macro_analysis_summary.json
       strict: raise RuntimeError if any m2_local values remain missing
       summary_path: path for generated run summary JSON
+      use_cache: reuse cached upstream responses (.cache/); False refetches everything
     """
 
+    if not use_cache:
+        print("[update] clearing HTTP cache...")
+        build_mod.clear_cache()
+
     print("[update] rebuilding dataset...")
     payload = build_mod.build()
 
-    DATA_DOCS.parent.mkdir(parents=True, exist_ok=True)
-    DATA_STATIC.parent.mkdir(parents=True, exist_ok=True)
-
-    txt = json.dumps(payload, indent=2)
-    DATA_DOCS.write_text(txt)
-    DATA_STATIC.write_text(txt)
+    build_mod.write_dataset(payload, DATA_DOCS, DATA_STATIC)
 
     print(f"[update] wrote {DATA_DOCS}")
     print(f"[update] wrote {DATA_STATIC}")
@@ -154,6 +158,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="exit non-zero if any missing m2_local values remain",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="discard cached World Bank/OECD/yfinance responses and refetch",
+    )
     p.add_argument(
         "--summary-path",
         default=str(SUMMARY_DEFAULT),
@@ -168,6 +177,7 @@ def main() -> None:
         run_analysis=not args.skip_analysis,
         strict=args.strict,
         summary_path=Path(args.summary_path),
+        use_cache=not args.no_cache,
     )
 
 